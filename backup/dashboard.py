@@ -1,11 +1,20 @@
+import glob
+import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, date
-from statistics import mean
-from math import log10
+from math import fsum
+from operator import itemgetter
 
 # ========= Pretty Print =========
+def sep_line(title: str):
+    return "\n" + "=" * 20 + f" {title} " + "=" * 20
+
 def print_sep(title: str):
-    print("\n" + "=" * 20 + f" {title} " + "=" * 20)
+    print(sep_line(title))
 
 def fmt2(x):
     try:
@@ -23,13 +32,22 @@ def fmt(x):
 SESSION = requests.Session()
 REQUEST_TIMEOUT = 10
 
+# 所有 backup 脚本共用这个 SESSION：keep-alive 连接池 + 429/5xx 自动重试
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+
 def get_json(url: str, *, headers=None, params=None, teapot_hint=False):
     try:
         r = SESSION.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
         if teapot_hint and r.status_code == 418:
             return {"blocked": True}     # 用结构返回，而不是打印
         r.raise_for_status()
-        return r.json()
+        return orjson.loads(r.content)   # 跳过 requests 的编码探测 + stdlib json
     except Exception as e:
         return {"error": str(e)}
 
@@ -62,6 +80,27 @@ def get_cnn_market_indexes():
     }
 
 # ========= 2. CNN Fear & Greed =========
+FG_KEYS = (
+    "put_call_options",
+    "market_volatility_vix",
+    "market_volatility_vix_50",
+    "market_momentum_sp500",
+    "market_momentum_sp125",
+    "stock_price_strength",
+    "stock_price_breadth",
+    "junk_bond_demand",
+    "safe_haven_demand"
+)
+
+def _fg_detail(obj):
+    if not obj:
+        return None
+    return {
+        "score": obj.get("score"),
+        "rating": obj.get("rating"),
+        "value": obj.get("data", [{}])[0].get("y")
+    }
+
 def get_cnn_fear_greed():
     today = datetime.now(timezone.utc).date().strftime("%Y-%m-%d")
     url = f"https://production.dataviz.cnn.io/index/fearandgreed/graphdata/{today}"
@@ -71,30 +110,7 @@ def get_cnn_fear_greed():
         return {"success": False, "data": None}
 
     fg = j.get("fear_and_greed", {})
-    details = {}
-
-    keys = [
-        "put_call_options",
-        "market_volatility_vix",
-        "market_volatility_vix_50",
-        "market_momentum_sp500",
-        "market_momentum_sp125",
-        "stock_price_strength",
-        "stock_price_breadth",
-        "junk_bond_demand",
-        "safe_haven_demand"
-    ]
-
-    for k in keys:
-        obj = j.get(k, {})
-        if not obj:
-            details[k] = None
-        else:
-            details[k] = {
-                "score": obj.get("score"),
-                "rating": obj.get("rating"),
-                "value": obj.get("data", [{}])[0].get("y")
-            }
+    details = {k: _fg_detail(j.get(k)) for k in FG_KEYS}
 
     return {
         "success": True,
@@ -120,9 +136,15 @@ OKX_HEADERS = {
 SYMBOLS = ["BTC-USDT", "ETH-USDT"]
 
 def get_okx_prices():
+    with ThreadPoolExecutor(max_workers=len(SYMBOLS)) as ex:
+        futures = {
+            inst: ex.submit(get_json, OKX_TICKER_URL, headers=OKX_HEADERS, params={"instId": inst})
+            for inst in SYMBOLS
+        }
+
     rows = []
-    for inst in SYMBOLS:
-        j = get_json(OKX_TICKER_URL, headers=OKX_HEADERS, params={"instId": inst})
+    for inst, f in futures.items():
+        j = f.result()
         if not j or "data" not in j or not j["data"]:
             rows.append({"inst": inst, "success": False})
             continue
@@ -145,31 +167,113 @@ def get_okx_prices():
 # ========= 4. AHR999 =========
 OKX_CANDLES = "https://www.okx.com/api/v5/market/candles"
 
-def get_ahr999():
-    # ---- 历史日线 ----
-    candles = get_json(OKX_CANDLES, params={"instId": "BTC-USDT", "bar": "1D", "limit": 400})
-    if not candles or "data" not in candles:
-        return {"success": False, "error": "no candles"}
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+# 与前端 getAhr999 一样用 1D（按 UTC+8 切分）；收盘时间 ts + 1 天 <= now 的 K 线才算已收盘
+CANDLE_BAR = "1D"
+DAY_MS = 86_400_000
+_BAR_OFFSET_MS = 8 * 3600 * 1000
+MIN_DAYS = 200
+
+_CLOSES_MEMO = {}
+_TS_CLOSE = itemgetter(0, 4)   # OKX candle: [ts, o, h, l, c, ...]
+
+GENESIS = datetime(2009, 1, 3, tzinfo=timezone.utc)
+_VAL_SCALE = 10 ** -17.01
+
+def ahr_valuation(now):
+    """AHR999 估值 10^(5.84·log10(币龄) - 17.01)，币龄按带小数的天数计（与前端 getAhr999 一致）"""
+    age_days = (now - GENESIS).total_seconds() / 86400.0
+    return age_days ** 5.84 * _VAL_SCALE   # 等价于原式，只做一次 pow
+
+def _candles_path(inst, bar, open_ms):
+    return os.path.join(DATA_DIR, f"candles_{inst}_{bar}_{open_ms}.json")
 
+def _write_candles_cache(inst, bar, open_ms, candles):
+    # 只在确认是完整日线后落盘，并清掉前几天的文件
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for old in glob.glob(os.path.join(DATA_DIR, f"candles_{inst}_{bar}_*.json")):
+        os.remove(old)
+    path = _candles_path(inst, bar, open_ms)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(candles))
+    os.replace(tmp, path)
+
+def _parse_closes(candles, now_ms):
+    # 解析时顺带丢掉未收盘的 K 线；元组按 ts 排序无需 key 函数
     rows = []
-    for arr in candles["data"]:
-        ts_ms = int(arr[0])
-        close = float(arr[4])
-        d_utc = datetime.fromtimestamp(ts_ms/1000, tz=timezone.utc).date()
-        rows.append((d_utc, close, ts_ms))
+    for t, c in map(_TS_CLOSE, candles["data"]):
+        ts_ms = int(t)
+        if ts_ms + DAY_MS <= now_ms:
+            rows.append((ts_ms, float(c)))
+    rows.sort()
+    return [c for _, c in rows]
+
+def _remember_closes(key, closes):
+    # 不足 MIN_DAYS 的结果不缓存，下次调用会重新拉取
+    if len(closes) >= MIN_DAYS:
+        _CLOSES_MEMO.clear()
+        _CLOSES_MEMO[key] = closes
+    return closes
+
+def load_daily_closes(inst="BTC-USDT", now=None):
+    """已收盘 1D 日线的收盘价（旧 → 新）；拿不到日线时返回 None"""
+    now = now or datetime.now(timezone.utc)
+    now_ms = int(now.timestamp() * 1000)
+    # 当前这根 1D K 线的开盘时刻（UTC+8 00:00）：之前开盘的都已收盘，已收盘集合只在此刻变化，用它做缓存键
+    open_ms = (now_ms + _BAR_OFFSET_MS) // DAY_MS * DAY_MS - _BAR_OFFSET_MS
+    key = (inst, open_ms)
+    if key in _CLOSES_MEMO:
+        return _CLOSES_MEMO[key]
+
+    bar = CANDLE_BAR
+    path = _candles_path(inst, bar, open_ms)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return _remember_closes(key, _parse_closes(orjson.loads(f.read()), now_ms))
 
-    rows.sort(key=lambda x: x[2])
-    today_utc = datetime.now(timezone.utc).date()
-    rows = [r for r in rows if r[0] < today_utc]
+    candles = get_json(OKX_CANDLES, params={"instId": inst, "bar": bar, "limit": 400})
+    # OKX 业务错误（限流等）也是 HTTP 200，需要看 code
+    if not isinstance(candles, dict) or candles.get("code") != "0" or not candles.get("data"):
+        return None
 
-    if len(rows) < 200:
+    closes = _parse_closes(candles, now_ms)
+    if len(closes) >= MIN_DAYS:
+        _write_candles_cache(inst, bar, open_ms, candles)
+    return _remember_closes(key, closes)
+
+def ahr_context(now=None):
+    """AHR999 中与实时价格无关的部分：200 日均线 + 当日估值"""
+    now = now or datetime.now(timezone.utc)
+
+    # ---- 历史日线 ----
+    closes = load_daily_closes("BTC-USDT", now)
+    if closes is None:
+        return {"success": False, "error": "no candles"}
+
+    if len(closes) < MIN_DAYS:
         return {"success": False, "error": "not enough days"}
 
-    closes = [c for _, c, _ in rows]
-    sma200 = mean(closes[-200:])
+    return {
+        "success": True,
+        "sma200": fsum(closes[-MIN_DAYS:]) / MIN_DAYS,
+        "valuation": ahr_valuation(now)
+    }
+
+def get_ahr999():
+    # 日线和实时价格互不依赖，并发请求
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        ctx_f = ex.submit(ahr_context)
+        tick_f = ex.submit(get_json, OKX_TICKER_URL, params={"instId": "BTC-USDT"})
+        ctx, tick = ctx_f.result(), tick_f.result()
+
+    if not ctx["success"]:
+        return ctx
+    sma200, val = ctx["sma200"], ctx["valuation"]
 
     # ---- 当前价格 ----
-    tick = get_json(OKX_TICKER_URL, params={"instId": "BTC-USDT"})
     if not tick or "data" not in tick or not tick["data"]:
         return {"success": False, "error": "no price"}
 
@@ -178,9 +282,6 @@ def get_ahr999():
     px_dt = datetime.fromtimestamp(ts_ms/1000, tz=timezone.utc)
 
     # ---- AHR999 ----
-    genesis = datetime(2009, 1, 3, tzinfo=timezone.utc)
-    age_days = (datetime.now(timezone.utc) - genesis).total_seconds() / 86400.0
-    val = 10 ** (5.84 * log10(age_days) - 17.01)
     ahr = (px / sma200) * (px / val)
 
     if ahr < 0.45:
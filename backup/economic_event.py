@@ -1,6 +1,7 @@
-import requests
 import json
 import os
+import orjson
+from dashboard import SESSION, REQUEST_TIMEOUT
 
 def fetch_events():
     url = "https://query1.finance.yahoo.com/ws/screeners/v1/finance/calendar-events"
@@ -22,13 +23,20 @@ def fetch_events():
         "Referer": "https://sg.finance.yahoo.com/quote/SGD%3DX/"
     }
 
-    r = requests.get(url, params=params, headers=headers)
-    data = r.json()
+    r = SESSION.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    data = orjson.loads(r.content)
 
-    # Save full JSON response to file beside this script
+    # Save full JSON response to file beside this script (only when it changed)
+    # 保持与仓库中已提交文件相同的格式（indent=2 + sort_keys），直接和现有文件字节比较
     out_path = os.path.join(os.path.dirname(__file__), "economic_events.json")
-    with open(out_path, "w") as f:
-        json.dump(data, f, indent=2, sort_keys=True)
+    payload = json.dumps(data, indent=2, sort_keys=True).encode()
+    prev = None
+    if os.path.exists(out_path):
+        with open(out_path, "rb") as f:
+            prev = f.read()
+    if payload != prev:
+        with open(out_path, "wb") as f:
+            f.write(payload)
 
     events = data["finance"]["result"]["economicEvents"]
 
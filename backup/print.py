@@ -1,57 +1,79 @@
 from dashboard import get_cnn_market_indexes, get_cnn_fear_greed, get_okx_prices, get_ahr999
-from dashboard import print_sep, fmt2, fmt
+from dashboard import sep_line, fmt2, fmt
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# 逐行格式模板：模块加载时绑定 .format，循环里不再重复解析 f-string 宽度说明
+INDEX_ROW = "{:15} {:10.2f} {:12.2f} {:10.2f} {:10.4%}".format
+FG_ROW = "{:30} {:10} {:15} {:10}".format
+OKX_ROW = "{:10} {:>12} {:>12} {:>12} {:10.2f}%".format
+
+
+def fetch_all():
+    # 四个数据源互相独立，并发请求（共享 dashboard.SESSION 连接池）
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        m = ex.submit(get_cnn_market_indexes)
+        fg = ex.submit(get_cnn_fear_greed)
+        okx = ex.submit(get_okx_prices)
+        a = ex.submit(get_ahr999)
+        return m.result(), fg.result(), okx.result(), a.result()
 
 
 def print_report():
+    m, fg, okx, a = fetch_all()
+
+    # 先拼好所有行，最后一次性写出
+    lines = []
+    emit = lines.append
+
     # 1) CNN Index
-    print_sep("CNN: Market Indexes")
-    m = get_cnn_market_indexes()
+    emit(sep_line("CNN: Market Indexes"))
     if not m["success"]:
-        print("No data.")
+        emit("No data.")
     else:
-        print(f"{'Name':15} {'Current':>10} {'Prev Close':>12} {'Change':>10} {'% Change':>10}")
-        print("-" * 70)
+        emit(f"{'Name':15} {'Current':>10} {'Prev Close':>12} {'Change':>10} {'% Change':>10}")
+        emit("-" * 70)
         for x in m["data"]:
-            print(f"{x['name']:15} {x['current']:10.2f} {x['prev']:12.2f} {x['change']:10.2f} {x['pct']:10.4%}")
+            emit(INDEX_ROW(x['name'], x['current'], x['prev'], x['change'], x['pct']))
 
     # 2) CNN Fear & Greed
-    print_sep("CNN: Fear & Greed")
-    fg = get_cnn_fear_greed()
+    emit(sep_line("CNN: Fear & Greed"))
     if not fg["success"]:
-        print("No data.")
+        emit("No data.")
     else:
         s = fg["summary"]
-        print(f"Score:    {fmt2(s['score'])} | Rating: {s['rating']}")
-        print(f"Prev:     {fmt2(s['prev'])}")
-        print(f"1W:       {fmt2(s['w1'])}")
-        print(f"1M:       {fmt2(s['m1'])}")
-        print(f"1Y:       {fmt2(s['y1'])}")
-        print()
-        print(f"{'Category':30} {'Score':10} {'Rating':15} {'Value':10}")
-        print("-" * 80)
+        emit(f"Score:    {fmt2(s['score'])} | Rating: {s['rating']}")
+        emit(f"Prev:     {fmt2(s['prev'])}")
+        emit(f"1W:       {fmt2(s['w1'])}")
+        emit(f"1M:       {fmt2(s['m1'])}")
+        emit(f"1Y:       {fmt2(s['y1'])}")
+        emit("")
+        emit(f"{'Category':30} {'Score':10} {'Rating':15} {'Value':10}")
+        emit("-" * 80)
         for k, obj in fg["details"].items():
             if not obj:
-                print(f"{k:30} {'-':10} {'-':15} {'-':10}")
+                emit(FG_ROW(k, '-', '-', '-'))
                 continue
-            print(f"{k:30} {fmt2(obj['score']):10} {obj['rating']:15} {fmt2(obj['value']):10}")
+            emit(FG_ROW(k, fmt2(obj['score']), obj['rating'], fmt2(obj['value'])))
 
     # 3) OKX Prices
-    print_sep("OKX: Index Prices (UTC open change)")
-    print(f"{'Symbol':10} {'Price':>12} {'Open(UTC)':>12} {'Change':>12} {'%Change':>10}")
-    print("-" * 65)
-    for r in get_okx_prices():
+    emit(sep_line("OKX: Index Prices (UTC open change)"))
+    emit(f"{'Symbol':10} {'Price':>12} {'Open(UTC)':>12} {'Change':>12} {'%Change':>10}")
+    emit("-" * 65)
+    for r in okx:
         if not r["success"]:
-            print(f"{r['inst']:10} ❌ no data")
+            emit(f"{r['inst']:10} ❌ no data")
             continue
-        print(f"{r['inst']:10} {fmt(r['price']):>12} {fmt(r['open']):>12} {fmt(r['change']):>12} {r['pct']:10.2f}%")
+        emit(OKX_ROW(r['inst'], fmt(r['price']), fmt(r['open']), fmt(r['change']), r['pct']))
 
     # 4) AHR999
-    print_sep("Real-time AHR999 (OKX index)")
-    a = get_ahr999()
+    emit(sep_line("Real-time AHR999 (OKX index)"))
     if not a["success"]:
-        print("No AHR999 data.")
+        emit("No AHR999 data.")
     else:
-        print(f"AHR999:        {a['ahr']:.6f}  {a['zone']}")
+        emit(f"AHR999:        {a['ahr']:.6f}  {a['zone']}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # ========= MAIN =========
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
-import requests
 import json
+from dashboard import SESSION, REQUEST_TIMEOUT
 
 def get_usd_sgd_snapshot():
     url = "https://query2.finance.yahoo.com/v8/finance/chart/SGD=X"
@@ -21,7 +21,7 @@ def get_usd_sgd_snapshot():
         "Referer": "https://sg.finance.yahoo.com/quote/SGD%3DX/"
     }
 
-    r = requests.get(url, params=params, headers=headers)
+    r = SESSION.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
     data = r.json()
 
     meta = data["chart"]["result"][0]["meta"]
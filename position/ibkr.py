@@ -1,5 +1,5 @@
 import os
-import yaml
+import orjson
 from datetime import datetime
 from dotenv import load_dotenv
 from ib_insync import IB
@@ -14,6 +14,9 @@ IB_HOST = os.getenv("IB_HOST", "127.0.0.1")
 IB_PORT = int(os.getenv("IB_PORT", "7496"))
 IB_CLIENT_ID = int(os.getenv("IB_CLIENT_ID", "1"))
 
+# 只需要这些账户字段
+ACCOUNT_TAGS = ("TotalCashValue",)
+
 # --- connect ---
 def ib_connect():
     ib = IB()
@@ -22,14 +25,15 @@ def ib_connect():
 
 # --- pull minimal IB data ---
 def pull_ibkr_data(ib):
-    summary = ib.accountSummary()
+    # accountValues / positions 都是 connect 时已订阅好的本地缓存，
+    # 不像 accountSummary() 那样再向 TWS 请求全部 ~60 个字段
+    values = ib.accountValues()
     positions = ib.positions()
 
-    # ✅ get only TotalCashValue
-    cash_value = None
-    for row in summary:
-        if row.tag == "TotalCashValue":
-            cash_value = float(row.value)
+    # ✅ get only TotalCashValue (from the account-updates cache, not accountSummary)
+    values_by_tag = {row.tag: row.value for row in values if row.tag in ACCOUNT_TAGS}
+    cash = values_by_tag.get("TotalCashValue")
+    cash_value = float(cash) if cash is not None else None
 
     # ✅ serialize minimal positions
     pos_list = []
@@ -62,10 +66,9 @@ def main():
         os.makedirs(DATA_DIR, exist_ok=True)
         # 保留 account.json 里原有的其他字段，只更新 timestamp / cash / positions
         if os.path.exists(JSON_PATH):
-            with open(JSON_PATH, "r") as f:
+            with open(JSON_PATH, "rb") as f:
                 try:
-                    import json
-                    existing = json.load(f)
+                    existing = orjson.loads(f.read())
                 except Exception:
                     existing = {}
         else:
@@ -83,10 +86,12 @@ def main():
             "positions": data["positions"],
         })
 
-        with open(JSON_PATH, "w") as f:
-            import json
-
-            json.dump(existing, f, ensure_ascii=False, indent=2)
+        # 先写临时文件再原子替换，中途崩溃不会留下半截的 account.json
+        payload = orjson.dumps(existing, option=orjson.OPT_INDENT_2)
+        tmp_path = JSON_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, JSON_PATH)
 
         print(f"✅ Updated {JSON_PATH}")
     finally:
@@ -14,6 +14,16 @@ const tradierBaseUrl = (process.env.TRADIER_BASE_URL ?? "https://api.tradier.com
 
 export const dynamic = "force-dynamic";
 
+// Short-lived quote cache: repeated dashboard polls within the TTL reuse the same Tradier response.
+// Expiry uses the monotonic performance.now() so wall-clock adjustments cannot extend or skip it.
+const QUOTE_CACHE_TTL_MS = 3000;
+const quoteCache = new Map<string, { expiresAt: number; quotes: Map<string, Quote> }>();
+const inflightQuotes = new Map<string, Promise<Map<string, Quote>>>();
+
+// Tradier takes comma-joined symbols in the query string; split large lists across requests
+const QUOTE_CHUNK_SIZE = 100;
+const QUOTE_MAX_CONCURRENCY = 8;
+
 function ensureArray<T>(item: T | T[] | undefined): T[] {
   if (item === undefined) return [];
   return Array.isArray(item) ? item : [item];
@@ -93,14 +103,7 @@ async function fetchUsdCnyRate(): Promise<number> {
   }
 }
 
-async function fetchQuotes(symbols: string[]): Promise<Map<string, Quote>> {
-  const tradierToken = process.env.TRADIER_TOKEN;
-  if (!tradierToken) {
-    throw new Error("TRADIER_TOKEN not configured.");
-  }
-  if (symbols.length === 0) {
-    return new Map();
-  }
+async function fetchQuoteChunk(symbols: string[], tradierToken: string): Promise<Quote[]> {
   const url = new URL("markets/quotes", tradierBaseUrl);
   url.searchParams.set("symbols", symbols.join(","));
   url.searchParams.set("greeks", "true");
@@ -118,7 +121,24 @@ async function fetchQuotes(symbols: string[]): Promise<Map<string, Quote>> {
   }
 
   const data = (await response.json()) as { quotes?: { quote?: Quote | Quote[] } };
-  const quotes = ensureArray(data.quotes?.quote);
+  return ensureArray(data.quotes?.quote);
+}
+
+async function requestQuotes(symbols: string[], tradierToken: string): Promise<Map<string, Quote>> {
+  // Keep each request URL bounded; chunks are fetched concurrently, a few at a time
+  const chunks: string[][] = [];
+  for (let i = 0; i < symbols.length; i += QUOTE_CHUNK_SIZE) {
+    chunks.push(symbols.slice(i, i + QUOTE_CHUNK_SIZE));
+  }
+  const quotes: Quote[] = [];
+  for (let i = 0; i < chunks.length; i += QUOTE_MAX_CONCURRENCY) {
+    const batch = chunks.slice(i, i + QUOTE_MAX_CONCURRENCY);
+    const results = await Promise.all(batch.map((chunk) => fetchQuoteChunk(chunk, tradierToken)));
+    for (const result of results) {
+      quotes.push(...result);
+    }
+  }
+
   const map = new Map<string, Quote>();
   for (const quote of quotes) {
     if (quote?.symbol) {
@@ -128,6 +148,45 @@ async function fetchQuotes(symbols: string[]): Promise<Map<string, Quote>> {
   return map;
 }
 
+async function fetchQuotes(symbols: string[]): Promise<Map<string, Quote>> {
+  const tradierToken = process.env.TRADIER_TOKEN;
+  if (!tradierToken) {
+    throw new Error("TRADIER_TOKEN not configured.");
+  }
+  if (symbols.length === 0) {
+    return new Map();
+  }
+
+  const cacheKey = [...symbols].sort().join(",");
+  const now = performance.now();
+  const cached = quoteCache.get(cacheKey);
+  if (cached && cached.expiresAt > now) {
+    return cached.quotes;
+  }
+
+  // Concurrent cache misses for the same symbol set share one upstream request
+  const inflight = inflightQuotes.get(cacheKey);
+  if (inflight) {
+    return inflight;
+  }
+
+  const pending = requestQuotes(symbols, tradierToken)
+    .then((map) => {
+      for (const [key, entry] of quoteCache) {
+        if (entry.expiresAt <= now) {
+          quoteCache.delete(key);
+        }
+      }
+      quoteCache.set(cacheKey, { expiresAt: performance.now() + QUOTE_CACHE_TTL_MS, quotes: map });
+      return map;
+    })
+    .finally(() => {
+      inflightQuotes.delete(cacheKey);
+    });
+  inflightQuotes.set(cacheKey, pending);
+  return pending;
+}
+
 export async function GET(request: Request) {
   if (!process.env.TRADIER_TOKEN) {
     return NextResponse.json(
@@ -155,47 +214,67 @@ export async function GET(request: Request) {
     }
     const symbols = Array.from(symbolSet);
 
+    // Crypto symbols only depend on the stored portfolio, so their prices can load alongside quotes and FX
+    const cryptoSymbols: string[] = [];
+
+    // Add BTC symbol for price fetching
+    const btcQty = portfolio.BTC_account?.amount ?? 0;
+    if (btcQty > 0) {
+      cryptoSymbols.push("BTC-USDT");
+    }
+
+    // Add crypto symbols for price fetching
+    if (portfolio.crypto && portfolio.crypto.length > 0) {
+      portfolio.crypto.forEach(c => {
+        const symbol = `${c.symbol}-USDT`;
+        if (!cryptoSymbols.includes(symbol)) {
+          cryptoSymbols.push(symbol);
+        }
+      });
+    }
+
+    // All upstream requests are independent: start them together instead of awaiting one by one
     const quotesPromise = fetchQuotes(symbols);
+    const cryptoPromise = cryptoSymbols.length > 0 ? getOkxPrices(cryptoSymbols) : Promise.resolve([]);
+    const [sgdResult, cnyResult] = await Promise.allSettled([fetchUsdSgdRate(), fetchUsdCnyRate()]);
 
     let usdSgdRate: number | undefined = portfolio.rates?.usd_sgd_rate;
-    try {
-      const freshRate = await fetchUsdSgdRate();
-      usdSgdRate = freshRate;
-      const updatedPortfolio: AccountData = {
-        ...portfolio,
-        rates: {
-          ...portfolio.rates,
-          usd_sgd_rate: freshRate,
-        },
-        timestamp: new Date().toISOString(),
-      };
-      await savePortfolioJson(updatedPortfolio);
-    } catch (fxError) {
-      console.error("[portfolio API] using cached USD/SGD rate from portfolio data due to fetch failure", fxError);
+    if (sgdResult.status === "fulfilled") {
+      usdSgdRate = sgdResult.value;
+    } else {
+      console.error("[portfolio API] using cached USD/SGD rate from portfolio data due to fetch failure", sgdResult.reason);
       if (usdSgdRate === undefined) {
         throw new Error("USD/SGD rate unavailable (API failed and no cached rate in portfolio data)");
       }
     }
 
     let usdCnyRate: number | undefined = portfolio.rates?.usd_cny_rate;
-    try {
-      const freshCnyRate = await fetchUsdCnyRate();
-      usdCnyRate = freshCnyRate;
+    if (cnyResult.status === "fulfilled") {
+      usdCnyRate = cnyResult.value;
+    } else {
+      console.error("[portfolio API] using cached USD/CNY rate from portfolio data due to fetch failure", cnyResult.reason);
+      if (usdCnyRate === undefined) {
+        // Use a default rate if unavailable (fallback)
+        usdCnyRate = 7.2;
+        console.warn("[portfolio API] Using default USD/CNY rate:", usdCnyRate);
+      }
+    }
+
+    // Persist fresh rates in a single write (both rates together, so one never overwrites the other)
+    if (sgdResult.status === "fulfilled" || cnyResult.status === "fulfilled") {
       const updatedPortfolio: AccountData = {
         ...portfolio,
         rates: {
           ...portfolio.rates,
-          usd_cny_rate: freshCnyRate,
+          ...(sgdResult.status === "fulfilled" ? { usd_sgd_rate: sgdResult.value } : {}),
+          ...(cnyResult.status === "fulfilled" ? { usd_cny_rate: cnyResult.value } : {}),
         },
         timestamp: new Date().toISOString(),
       };
-      await savePortfolioJson(updatedPortfolio);
-    } catch (fxError) {
-      console.error("[portfolio API] using cached USD/CNY rate from portfolio data due to fetch failure", fxError);
-      if (usdCnyRate === undefined) {
-        // Use a default rate if unavailable (fallback)
-        usdCnyRate = 7.2;
-        console.warn("[portfolio API] Using default USD/CNY rate:", usdCnyRate);
+      try {
+        await savePortfolioJson(updatedPortfolio);
+      } catch (saveError) {
+        console.error("[portfolio API] Failed to persist fresh FX rates:", saveError);
       }
     }
 
@@ -207,38 +286,18 @@ export async function GET(request: Request) {
       throw new Error("USD/CNY rate unavailable (no live or cached value)");
     }
 
-    // Fetch crypto prices
+    // Collect crypto prices
     const cryptoPrices = new Map<string, number>();
-    const cryptoSymbols: string[] = [];
-    
-    // Add BTC symbol for price fetching
-    const btcQty = portfolio.BTC_account?.amount ?? 0;
-    if (btcQty > 0) {
-      cryptoSymbols.push("BTC-USDT");
-    }
-    
-    // Add crypto symbols for price fetching
-    if (portfolio.crypto && portfolio.crypto.length > 0) {
-      portfolio.crypto.forEach(c => {
-        const symbol = `${c.symbol}-USDT`;
-        if (!cryptoSymbols.includes(symbol)) {
-          cryptoSymbols.push(symbol);
-        }
-      });
-    }
-    
-    if (cryptoSymbols.length > 0) {
-      try {
-        const okxPrices = await getOkxPrices(cryptoSymbols);
-        for (const priceData of okxPrices) {
-          if (priceData.success && priceData.price !== undefined) {
-            cryptoPrices.set(priceData.inst, priceData.price);
-          }
+    try {
+      const okxPrices = await cryptoPromise;
+      for (const priceData of okxPrices) {
+        if (priceData.success && priceData.price !== undefined) {
+          cryptoPrices.set(priceData.inst, priceData.price);
         }
-      } catch (cryptoError) {
-        console.error("[portfolio API] Failed to fetch crypto prices:", cryptoError);
-        // Continue without crypto prices - will use cost basis as fallback
       }
+    } catch (cryptoError) {
+      console.error("[portfolio API] Failed to fetch crypto prices:", cryptoError);
+      // Continue without crypto prices - will use cost basis as fallback
     }
 
     // Reload portfolio data before building response to ensure we have latest account_info
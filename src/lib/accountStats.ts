@@ -138,13 +138,11 @@ export function toOccSymbol(pos: RawPosition): string | null {
   if (pos.secType !== "OPT" || !pos.expiry || !pos.right || pos.strike === undefined) {
     return null;
   }
-  const date = pos.expiry;
-  const yy = date.slice(2, 4);
-  const mm = date.slice(4, 6);
-  const dd = date.slice(6, 8);
+  // expiry 固定为 YYYYMMDD，直接截取 YYMMDD，无需日期解析
+  const yymmdd = pos.expiry.slice(2, 8);
   const cp = pos.right === "C" ? "C" : "P";
   const strikeInt = Math.round((pos.strike ?? 0) * 1000);
-  return `${pos.symbol}${yy}${mm}${dd}${cp}${strikeInt.toString().padStart(8, "0")}`;
+  return `${pos.symbol}${yymmdd}${cp}${strikeInt.toString().padStart(8, "0")}`;
 }
 
 function convertGreek(value: number | undefined, qty: number): number {
@@ -182,6 +180,25 @@ function asNumber(value: unknown): number {
   return Number.isFinite(num) ? num : 0;
 }
 
+/**
+ * 报价中间价；盘后 bid/ask 常缺一边，此时退回有值的一边或 last，避免价格被腰斩
+ * 注意区分“缺失”(null/undefined) 与真实的 0 bid（便宜的虚值期权很常见），后者仍取中间价
+ */
+function midPrice(quote: Quote | undefined): number {
+  const hasBid = quote?.bid != null;
+  const hasAsk = quote?.ask != null;
+  if (hasBid && hasAsk) {
+    return (asNumber(quote?.bid) + asNumber(quote?.ask)) / 2;
+  }
+  if (hasBid) {
+    return asNumber(quote?.bid);
+  }
+  if (hasAsk) {
+    return asNumber(quote?.ask);
+  }
+  return asNumber(quote?.last);
+}
+
 // Hardcoded ETF symbols (treat as ETF even if marked as STK in JSON)
 const ETF_SYMBOLS = ["GLDM"];
 
@@ -257,28 +274,27 @@ export function buildPortfolioData(
   for (const rawPos of orderedPositions) {
     const qty = asNumber(rawPos.position);
     const cost = asNumber(rawPos.avgCost);
+    const isOption = rawPos.secType === "OPT";
+    // 期权报价按每股计，一张合约 = 100 股
+    const contractMult = isOption ? 100 : 1;
 
     // Check if this is an ETF (either marked as ETF or in hardcoded list)
     const isETF = rawPos.secType === "ETF" || ETF_SYMBOLS.includes(rawPos.symbol);
     const effectiveSecType = isETF ? "ETF" : rawPos.secType;
 
-    const symbolKey = rawPos.secType === "OPT" ? toOccSymbol(rawPos) : rawPos.symbol;
+    const symbolKey = isOption ? toOccSymbol(rawPos) : rawPos.symbol;
     const quote = symbolKey ? quotes.get(symbolKey) : undefined;
-    const underlyingQuote = rawPos.secType === "OPT" ? quotes.get(rawPos.symbol) : quote;
-    const bid = asNumber(quote?.bid);
-    const ask = asNumber(quote?.ask);
-    const midPrice = (bid + ask) / 2;
-    const price = rawPos.secType === "OPT" ? midPrice * 100 : midPrice;
-    const underlyingBid = asNumber(underlyingQuote?.bid);
-    const underlyingAsk = asNumber(underlyingQuote?.ask);
-    const underlyingMid = (underlyingBid + underlyingAsk) / 2;
+    const underlyingQuote = isOption ? quotes.get(rawPos.symbol) : quote;
+    const mid = midPrice(quote);
+    const price = mid * contractMult;
+    const underlyingMid = midPrice(underlyingQuote);
 
     const upnl = (price - cost) * qty;
 
     let delta = 0;
     let gamma = 0;
     let theta = 0;
-    if (rawPos.secType === "OPT") {
+    if (isOption) {
       delta = convertGreek(quote?.greeks?.delta, qty);
       gamma = convertGreek(quote?.greeks?.gamma, qty);
       theta = convertGreek(quote?.greeks?.theta, qty);
@@ -289,7 +305,7 @@ export function buildPortfolioData(
     }
 
     const marketValue = price * qty;
-    if (rawPos.secType === "OPT") {
+    if (isOption) {
       totalOptionMV += marketValue;
     } else if (isETF) {
       // ETF market value - tracked separately
@@ -300,16 +316,16 @@ export function buildPortfolioData(
     totalUpnl += upnl;
 
     positionsOutput.push({
-      symbol: rawPos.secType === "OPT" ? (symbolKey ?? rawPos.symbol) : rawPos.symbol,
+      symbol: isOption ? (symbolKey ?? rawPos.symbol) : rawPos.symbol,
       secType: effectiveSecType,
       qty,
       cost,
       price,
-      underlyingPrice: rawPos.secType === "OPT" ? underlyingMid : price,
+      underlyingPrice: isOption ? underlyingMid : price,
       upnl,
-      is_option: rawPos.secType === "OPT",
+      is_option: isOption,
       is_crypto: false,
-      dteDays: rawPos.secType === "OPT" ? calculateDteDays(rawPos.expiry) : undefined,
+      dteDays: isOption ? calculateDteDays(rawPos.expiry) : undefined,
       delta,
       gamma,
       theta,
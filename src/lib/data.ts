@@ -238,8 +238,9 @@ export async function getAhr999(): Promise<Ahr999> {
     rows.push([dUtc, close, tsMs]);
   }
   rows.sort((a, b) => a[2] - b[2]);
-  const todayUtc = new Date();
-  const trimmed = rows.filter((r) => r[0] < todayUtc);
+  // Only finished candles: 1D bars split at UTC+8, so a bar is closed once ts + 1 day <= now (same rule as backup/dashboard.py)
+  const nowMs = Date.now();
+  const trimmed = rows.filter((r) => r[2] + 86400_000 <= nowMs);
   if (trimmed.length < 200) return { success: false, error: "not enough days" };
   const closes = trimmed.map((r) => r[1]);
   const last200 = closes.slice(-200);
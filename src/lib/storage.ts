@@ -5,6 +5,7 @@
  * No local file or Vercel Blob storage dependencies.
  */
 
+import type { Pool, PoolClient } from "pg";
 import type { PortfolioYaml, PortfolioData } from "@/types";
 import { computeUpdatedAccountInfoWithMdd } from "@/lib/accountStats";
 import { isUsMarketOpen } from "@/lib/market";
@@ -22,6 +23,33 @@ async function getPgClient() {
   return pg;
 }
 
+// Shared connection pool: reuse warm connections (TCP + TLS) across queries instead of a new Client per call
+// Cache the promise (assigned synchronously) so concurrent first callers share one Pool
+let pgPoolPromise: Promise<Pool> | null = null;
+function getPgPool(): Promise<Pool> {
+  if (!pgPoolPromise) {
+    pgPoolPromise = getPgClient()
+      .then((pgModule) => {
+        const pool = new pgModule.Pool({
+          connectionString: DATABASE_URL,
+          max: 5,
+          idleTimeoutMillis: 30000,
+        });
+        // Idle clients can be dropped by the server; log instead of crashing the process
+        pool.on("error", (error) => {
+          console.error("[storage] Idle PostgreSQL client error:", error);
+        });
+        return pool;
+      })
+      .catch((error) => {
+        // Don't cache a failed import; let the next call retry
+        pgPoolPromise = null;
+        throw error;
+      });
+  }
+  return pgPoolPromise;
+}
+
 // Neon PostgreSQL connection configuration
 export const DATABASE_URL = process.env.DATABASE_URL || "";
 export const HISTORY_TABLE_NAME = "history";
@@ -84,18 +112,18 @@ export type AccountData = PortfolioYaml & {
 
 /**
  * Read account data from PostgreSQL database as JSONB
- * @returns Raw JSON string or null if not found
+ * @returns Parsed JSONB value (pg already decodes it) or null if not found
  */
-async function readAccountFromDatabase(): Promise<string | null> {
+async function readAccountFromDatabase(): Promise<unknown> {
   if (!DATABASE_URL) {
     throw new Error("DATABASE_URL is not configured");
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     const result = await client.query(
       `SELECT data FROM ${ACCOUNT_TABLE_NAME} ORDER BY id DESC LIMIT 1`
     );
@@ -104,14 +132,12 @@ async function readAccountFromDatabase(): Promise<string | null> {
       return null;
     }
 
-    // Convert JSONB to JSON string
-    const jsonbData = result.rows[0].data;
-    return JSON.stringify(jsonbData, null, 2);
+    return result.rows[0].data ?? null;
   } catch (error) {
     console.error("[storage] Failed to read account from database:", error);
     throw error;
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
@@ -124,7 +150,8 @@ export async function readJsonRaw(): Promise<string | null> {
     throw new Error("DATABASE_URL is not configured for account storage");
   }
 
-  return await readAccountFromDatabase();
+  const data = await readAccountFromDatabase();
+  return data == null ? null : JSON.stringify(data, null, 2);
 }
 
 /**
@@ -133,14 +160,17 @@ export async function readJsonRaw(): Promise<string | null> {
  * @throws Error if file not found or invalid
  */
 export async function loadPortfolioJson(): Promise<AccountData> {
-  const raw = await readJsonRaw();
+  if (!DATABASE_URL) {
+    throw new Error("DATABASE_URL is not configured for account storage");
+  }
+
+  // pg 已把 JSONB 解码成对象，直接使用，不再 stringify → JSON.parse 绕一圈
+  const parsed = (await readAccountFromDatabase()) as AccountData | null;
   
-  if (!raw) {
+  if (!parsed) {
     throw new Error("Portfolio data not found. Please input JSON data in the modal first.");
   }
   
-  const parsed = JSON.parse(raw) as AccountData;
-  
   if (!parsed || typeof parsed !== "object") {
     throw new Error("Failed to parse portfolio JSON file.");
   }
@@ -162,11 +192,11 @@ async function saveAccountToDatabase(content: string): Promise<void> {
     throw new Error("DATABASE_URL is not configured");
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     
     // Parse JSON to validate
     const accountData = JSON.parse(content);
@@ -186,7 +216,7 @@ async function saveAccountToDatabase(content: string): Promise<void> {
     console.error("[storage] Failed to save account to database:", errorMessage);
     throw new Error(`Failed to save account to database: ${errorMessage}`);
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
@@ -267,11 +297,11 @@ async function readHistoryFromNeon(): Promise<HistoryEntry[]> {
     throw new Error("DATABASE_URL is not configured");
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     console.log("[storage] Connected to PostgreSQL database");
 
     const result = await client.query(
@@ -300,7 +330,7 @@ async function readHistoryFromNeon(): Promise<HistoryEntry[]> {
     console.error("[storage] PostgreSQL read error:", errorMessage);
     throw new Error(`Failed to read history from database: ${errorMessage}`);
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
@@ -335,11 +365,11 @@ async function insertHistoryToNeon(entries: HistoryEntry[]): Promise<void> {
     return;
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     console.log(`[storage] Inserting ${entries.length} entries into database`);
 
     // Insert in batches to avoid issues with large payloads
@@ -394,7 +424,7 @@ async function insertHistoryToNeon(entries: HistoryEntry[]): Promise<void> {
     
     throw new Error(`Failed to insert history to database: ${errorMessage}`);
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
@@ -408,11 +438,11 @@ async function insertSingleHistoryEntry(entry: HistoryEntry): Promise<number> {
     throw new Error("DATABASE_URL is not configured");
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     
     const query = `
       INSERT INTO ${HISTORY_TABLE_NAME} 
@@ -441,7 +471,7 @@ async function insertSingleHistoryEntry(entry: HistoryEntry): Promise<number> {
     console.error("[storage] PostgreSQL insert error:", errorMessage);
     throw new Error(`Failed to insert history entry: ${errorMessage}`);
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
@@ -481,11 +511,11 @@ export async function saveHistory(entries: HistoryEntry[]): Promise<void> {
     throw new Error("DATABASE_URL is not configured");
   }
 
-  const pgModule = await getPgClient();
-  const client = new pgModule.Client({ connectionString: DATABASE_URL });
+  const pool = await getPgPool();
+  let client: PoolClient | undefined;
 
   try {
-    await client.connect();
+    client = await pool.connect();
     console.log("[storage] Connected to PostgreSQL for saveHistory");
 
     // Delete all existing entries
@@ -506,7 +536,7 @@ export async function saveHistory(entries: HistoryEntry[]): Promise<void> {
     console.error("[storage] PostgreSQL saveHistory error:", errorMessage);
     throw new Error(`Failed to save history: ${errorMessage}`);
   } finally {
-    await client.end();
+    client?.release();
   }
 }
 
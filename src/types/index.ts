@@ -67,6 +67,7 @@ export type Quote = {
   symbol: string;
   bid?: number;
   ask?: number;
+  last?: number;
   greeks?: {
     delta?: number;
     gamma?: number;